@@ -35,6 +35,7 @@ setup(
             "google-cloud-storage>=2.0.0",
             "boto3>=1.21.21",
             "boto3-stubs-lite[essential]>=1.21.21",
+            "orjson>=3.0.0",
         ],
         # Individual sets of dependencies
         "address-validation": ["googlemaps==4.10.0"],
@@ -45,5 +46,6 @@ setup(
         "ssh": ["paramiko>=2.8.0"],
         "gcs": ["google-cloud-storage>=2.0.0"],
         "s3": ["boto3>=1.21.21", "boto3-stubs-lite[essential]>=1.21.21"],
+        "fast-json": ["orjson>=3.0.0"],
     },
 )
@@ -1,5 +1,8 @@
 """Tasks related to interacting with the Tamr Core-connect"""
 import logging
+import time
+from typing import Tuple
+from weakref import WeakKeyDictionary
 from tamr_toolbox.models.data_type import JsonDict
 from tamr_unify_client import Client
 from tamr_toolbox.utils import version
@@ -8,6 +11,31 @@ from tamr_toolbox.data_io import common
 
 LOGGER = logging.getLogger(__name__)
 
+# Seconds for which the Tamr version fetched for a client is reused
+_VERSION_TTL = 300
+# Maps each client to its Tamr version and the time until which that version is reused. Weak
+# keys let clients, with their sessions and credentials, be freed once the caller drops them
+_VERSION_CACHE: "WeakKeyDictionary[Client, Tuple[str, float]]" = WeakKeyDictionary()
+
+
+def _current_version(client: Client) -> str:
+    """
+    Gets the version of Tamr for provided client, probing the instance at most once every
+    `_VERSION_TTL` seconds per client
+
+    Args:
+        client: Tamr unify client object.
+
+    Returns:
+        String representation of Tamr version
+    """
+    cached = _VERSION_CACHE.get(client)
+    if cached is not None and time.monotonic() < cached[1]:
+        return cached[0]
+    tamr_version = version.current(client)
+    _VERSION_CACHE[client] = (tamr_version, time.monotonic() + _VERSION_TTL)
+    return tamr_version
+
 
 def jdbc_ingest(
     *,
@@ -41,11 +69,9 @@ def jdbc_ingest(
     """
 
     # Check Tamr version
-    if version.is_version_condition_met(
-        tamr_version=version.current(client), min_version=tamr_min_version
+    if not version.is_version_condition_met(
+        tamr_version=_current_version(client), min_version=tamr_min_version
     ):
-        None
-    else:
         error_message = "Toolbox does not support core-connect for current version of Tamr."
         LOGGER.error(error_message)
         raise Exception(error_message)
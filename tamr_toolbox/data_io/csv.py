@@ -1,10 +1,12 @@
 """Tasks related to moving data in or out of Tamr using delimited files"""
-from typing import Optional, List, Union, Dict
-from functools import partial
+from typing import Optional, List, Union, Dict, Iterator, Any, Tuple, Callable, Collection
+from functools import lru_cache, partial
 from pathlib import Path
 
 import csv
+import itertools
 import logging
+import operator
 import os
 import requests
 
@@ -16,6 +18,10 @@ from tamr_toolbox.data_io import common
 
 LOGGER = logging.getLogger(__name__)
 
+# Size in bytes of the buffer used when writing csv files. Larger than the default so that
+# large exports are written to disk in fewer, larger writes
+_FILE_BUFFER_SIZE = 4 * 1024 * 1024
+
 
 def from_dataset(
     dataset: Dataset,
@@ -35,9 +41,9 @@ def from_dataset(
     encoding: str = "utf-8",
 ) -> int:
     """
-    Export a Tamr Dataset to a csv file. Records are streamed to disk and written according to a
-    given buffer size. As a result this is more memory efficient than first reading to a
-    pandas.DataFrame and writing to CSV.
+    Export a Tamr Dataset to a csv file. Records are streamed to disk through a file buffer.
+    As a result this is more memory efficient than first reading to a pandas.DataFrame and
+    writing to CSV.
 
     Args:
         dataset: Tamr Dataset object
@@ -58,7 +64,8 @@ def from_dataset(
         nrows: Optional, Number of rows to write. If None, then write all rows.
         allow_dataset_refresh: If True, allows running a job to refresh dataset to make streamable.
             Otherwise a RuntimeError will be thrown if the dataset is unstreamable.
-        buffer_size: Number of records to store in memory before writing to disk
+        buffer_size: Number of records written between progress log messages. Records are
+            streamed directly to the file buffer rather than held in memory
         overwrite: if True and export_file_name already exists, overwrite the file.
             Otherwise throw an error
         encoding: The encoding to use in the written file.
@@ -98,7 +105,13 @@ def from_dataset(
         LOGGER.error(message)
         raise ValueError(message)
 
-    attribute_names = [attr.name for attr in dataset.attributes]
+    # Stream the attributes once, noting which hold lists and so need flattening
+    attribute_names = []
+    list_attribute_names = set()
+    for attr in dataset.attributes:
+        attribute_names.append(attr.name)
+        if attr.type.base_type == "ARRAY":
+            list_attribute_names.add(attr.name)
 
     # check that specified columns exist
     if columns is not None:
@@ -125,59 +138,46 @@ def from_dataset(
         dataset_attribute_names=attribute_names, column_name_dict=column_name_dict, columns=columns
     )
 
+    project_row = _make_row_projector(
+        tuple(full_column_name_dict.keys()),
+        list_columns=list_attribute_names,
+        flatten=func,
+        na_value=na_value,
+    )
+
     # Open CSV file and use newline='' as recommended by
     # https://docs.python.org/3/library/csv.html#csv.writer
-    with open(export_file_path, "w", newline="", encoding=encoding) as csv_file:
+    with open(
+        export_file_path, "w", newline="", encoding=encoding, buffering=_FILE_BUFFER_SIZE
+    ) as csv_file:
         csv_writer = csv.writer(
-            csv_file, delimiter=csv_delimiter, quotechar=quote_character, quoting=quoting
+            csv_file,
+            dialect=_get_dialect(
+                delimiter=csv_delimiter, quote_character=quote_character, quoting=quoting
+            ),
         )
-        buffer = []
-        header = None
-        # Set record number to -1 in case the dataset streamed has no records
-        record_number = -1
-
-        for record_number, record in enumerate(
-            common._yield_records(dataset, func=func, columns=columns)
-        ):
-            # Obtain and write the header information only on the first pass
-            if header is None:
-                header = full_column_name_dict.values()
-                csv_writer.writerow(header)
-
-            # Replace empty values with a specific null value
-            # This also allows nulls to be treated differently from empty strings
-            record = [
-                na_value if record[k] is None else record[k] for k in full_column_name_dict.keys()
-            ]
-            buffer.append(record)
-
-            at_max_buffer = buffer_size is not None and (len(buffer) >= buffer_size)
-            at_max_rows = nrows is not None and record_number >= nrows - 1
-            if at_max_buffer or at_max_rows:
-                csv_writer.writerows(buffer)
-                LOGGER.debug(f"Written dataset {dataset.name} up to record {record_number+1}")
-                buffer = []
-                if at_max_rows:
-                    break
-
-        # Write anything remaining
-        # This will occur whenever the buffer is non-zero and the number of records
-        # is not exactly divisible by the buffer number
-        # For example, writing a dataset with 1100 records using a buffer size of 500
-        # will write in 3 chunks: 2 x 500 above and the remaining 100 handled here
-        if len(buffer) != 0:
-            LOGGER.debug(f"Written dataset {dataset.name} up to record {record_number + 1}")
-            csv_writer.writerows(buffer)
-
-        if record_number == -1:
-            # If record number is -1 then no records were streamed, possibly because the dataset
-            # has no records. We therefore want to simply save the headers
-            if columns is not None:
-                csv_writer.writerow(columns)
-            else:
-                csv_writer.writerow(attribute_names)
+        # Write the header up front so that it is also written for datasets with no records
+        csv_writer.writerow(full_column_name_dict.values())
+
+        # Lists are flattened by `project_row`, in the same pass as the projection and null
+        # replacement, so the records are streamed without a flattening function
+        records = common._yield_records(dataset, columns=columns)
+        if nrows is not None:
+            records = itertools.islice(records, nrows)
 
-    records_written = record_number + 1
+        records_written = 0
+
+        def _log_progress(rows: Iterator[List]) -> Iterator[List]:
+            """Passes rows through, counting them and logging progress every `buffer_size` rows"""
+            nonlocal records_written
+            for records_written, row in enumerate(rows, start=1):
+                yield row
+                if buffer_size and records_written % buffer_size == 0:
+                    LOGGER.debug(f"Written dataset {dataset.name} up to record {records_written}")
+
+        # writerows consumes the rows lazily, so they go straight into the file buffer
+        # without being collected in an intermediate list
+        csv_writer.writerows(_log_progress(map(project_row, records)))
 
     LOGGER.info(
         f"Wrote {records_written} from dataset {dataset.name} (id={dataset.resource_id}) "
@@ -187,6 +187,95 @@ def from_dataset(
     return records_written
 
 
+@lru_cache(maxsize=None)
+def _get_dialect(*, delimiter: str, quote_character: str, quoting: int) -> str:
+    """
+    Registers a csv dialect for the given writer options, once per combination of options, so
+    that the options are not validated again for every file written with them
+
+    Args:
+        delimiter: Delimiter of the csv file
+        quote_character: Character used to escape values
+        quoting: The escape strategy to use according to the Python csv writer
+
+    Returns:
+        Name of the registered dialect
+    """
+    name = f"tamr_toolbox:{delimiter!r}:{quote_character!r}:{quoting}"
+    csv.register_dialect(name, delimiter=delimiter, quotechar=quote_character, quoting=quoting)
+    return name
+
+
+def _make_row_projector(
+    column_keys: Tuple[str, ...],
+    *,
+    list_columns: Collection[str],
+    flatten: Callable[[List], str],
+    na_value: str,
+) -> Callable[[Dict], List]:
+    """
+    Builds a function converting a record to a csv row. The row holds the values of
+    `column_keys` in order, with values of `list_columns` flattened and empty values replaced
+    by `na_value`.
+
+    Args:
+        column_keys: record keys of the columns to output, in order
+        list_columns: keys of the columns holding lists, only these are flattened
+        flatten: function used to flatten list values to strings
+        na_value: value to write in place of empty values
+
+    Returns:
+        Function taking a record dictionary and returning the row as a list
+    """
+    # Extract the values of the output columns from each record in a single call.
+    # itemgetter returns a bare value rather than a tuple when given a single key
+    if len(column_keys) > 1:
+        get_values = operator.itemgetter(*column_keys)
+    else:
+
+        def get_values(record: Dict) -> tuple:
+            return tuple(record[k] for k in column_keys)
+
+    # Whether each output column needs flattening is fixed by its type, so decide it up front
+    flatten_flags = tuple(key in list_columns for key in column_keys)
+
+    # Replace empty values with a specific null value
+    # This also allows nulls to be treated differently from empty strings
+    if not any(flatten_flags):
+
+        def project_row(record: Dict) -> List:
+            return [na_value if value is None else value for value in get_values(record)]
+
+    else:
+
+        def project_row(record: Dict) -> List:
+            return [
+                na_value if value is None else flatten(value) if do_flatten else value
+                for do_flatten, value in zip(flatten_flags, get_values(record))
+            ]
+
+    return project_row
+
+
+def _needs_quoting(value: Any, *, special_characters: Tuple[str, ...]) -> bool:
+    """
+    Checks whether a value could be quoted or converted by a csv writer using
+    `csv.QUOTE_MINIMAL`. Empty strings are treated as needing quoting since a row made of a
+    single empty field is quoted.
+
+    Args:
+        value: value to check
+        special_characters: characters that cause a value to be quoted, i.e. the delimiter,
+            quote character and line breaks
+
+    Returns:
+        True if the value is not a non-empty string free of special characters
+    """
+    if not isinstance(value, str) or not value:
+        return True
+    return any(character in value for character in special_characters)
+
+
 def from_taxonomy(
     project: Project,
     export_file_path: Union[Path, str],
@@ -259,26 +348,20 @@ def from_taxonomy(
         raise ValueError(message)
 
     try:
-        taxonomy = project.as_categorization().taxonomy()
+        taxonomy = project.taxonomy()
     except requests.exceptions.RequestException:
         no_taxonomy_error = f"Project {project.name} is not associated with any taxonomy yet."
         LOGGER.error(no_taxonomy_error)
         raise RuntimeError(no_taxonomy_error)
 
-    # obtain categories and store in a list
-    categories = taxonomy.categories()
-    taxonomy_list = []
-    for category in categories:
-        taxonomy_list.append(category.path)
-
-    # sort the categories
-    taxonomy_list.sort()
+    # obtain the sorted category paths
+    taxonomy_list = sorted(category.path for category in taxonomy.categories())
 
     # Open CSV file and use newline='' as recommended by
     # https://docs.python.org/3/library/csv.html#csv.writer
 
     try:
-        f = open(export_file_path, "w", newline="", encoding=encoding)
+        f = open(export_file_path, "w", newline="", encoding=encoding, buffering=_FILE_BUFFER_SIZE)
     except (FileNotFoundError, IOError, PermissionError):
         cannot_open_error = f"File path {export_file_path} could not be opened for writing."
         LOGGER.error(cannot_open_error)
@@ -286,9 +369,25 @@ def from_taxonomy(
     else:
         try:
             csv_writer = csv.writer(
-                f, delimiter=csv_delimiter, quotechar=quote_character, quoting=quoting
+                f,
+                dialect=_get_dialect(
+                    delimiter=csv_delimiter, quote_character=quote_character, quoting=quoting
+                ),
             )
-            csv_writer.writerows(taxonomy_list)
+            special_characters = (csv_delimiter, quote_character, "\r", "\n")
+            if quoting == csv.QUOTE_MINIMAL and not any(
+                _needs_quoting(value, special_characters=special_characters)
+                for path in taxonomy_list
+                for value in path
+            ):
+                # No value would be quoted by the csv writer, so the output can be built as a
+                # single string and written in one call
+                lineterminator = csv_writer.dialect.lineterminator
+                f.write(
+                    "".join(csv_delimiter.join(path) + lineterminator for path in taxonomy_list)
+                )
+            else:
+                csv_writer.writerows(taxonomy_list)
         except csv.Error as e:
             general_error = (
                 "Encountered an error while writing taxonomy categories to "
@@ -3,7 +3,7 @@ import os
 import logging
 
 from typing import Optional, List, Callable, Any, Iterable, Tuple
-from collections import OrderedDict, defaultdict
+from collections import defaultdict
 from functools import partial
 
 from tamr_unify_client.dataset.resource import Dataset
@@ -42,10 +42,13 @@ def _flatten_list_series(
 
     Returns: Series of flattened values
     """
+    # only columns of object dtype can hold lists, others are returned without visiting values
+    if series.dtype != object:
+        return series
     func = partial(common._flatten_list, delimiter=delimiter, force=force)
     # if we haven't specified which columns, or this column is in the list, apply the function
     if columns is None or series.name in columns:
-        return series.apply(func)
+        return series.map(func)
     # otherwise do nothing
     else:
         return series
@@ -120,8 +123,9 @@ def from_dataset(
     LOGGER.info(
         f"Streaming records to DataFrame for dataset {dataset.name} (id={dataset.resource_id})."
     )
-    dataset_attrs = [attr for attr in dataset.attributes]
-    attr_names = [attr.name for attr in dataset_attrs]
+    # stream the attributes once, keeping the type of each attribute for the flattening checks
+    attr_types = {attr.name: attr.type for attr in dataset.attributes}
+    attr_names = list(attr_types)
     # check that specified columns exist
     if columns is not None:
         common._check_columns_subset(
@@ -130,27 +134,33 @@ def from_dataset(
     # checks on columns to flatten
     if flatten_delimiter is not None:
         if flatten_columns is None:
-            flatten_columns = list(attr_names)
+            flatten_columns = attr_names
         else:
             # check that specified columns exist
             common._check_columns_subset(
                 input_list=flatten_columns, reference_list=attr_names, raise_error=True
             )
         # check types of flatten_columns
-        for attr in dataset_attrs:
-            if attr.name not in flatten_columns:
+        columns_to_flatten = []
+        for attr_name in flatten_columns:
+            attr_type = attr_types[attr_name]
+            if attr_type.base_type != "ARRAY":
+                # only list values are changed by flattening, skip the per-record call
                 continue
-            attr_type = attr.spec().to_dict()["type"]
-            if attr_type["baseType"] == "ARRAY" and attr_type["innerType"]["baseType"] != "STRING":
+            if attr_type.inner_type.base_type != "STRING":
                 if force_flatten:
                     LOGGER.info(
-                        f"Will force attribute to string: {attr.name}, with type: {attr_type}"
+                        f"Will force attribute to string: {attr_name}, "
+                        f"with type: {attr_type.spec().to_dict()}"
                     )
                 else:
                     LOGGER.warning(
-                        f"Will not flatten attribute: {attr.name}, with type: {attr_type}"
+                        f"Will not flatten attribute: {attr_name}, "
+                        f"with type: {attr_type.spec().to_dict()}"
                     )
-                    flatten_columns.remove(attr.name)
+                    continue
+            columns_to_flatten.append(attr_name)
+        flatten_columns = columns_to_flatten
 
     if not dataset.status().is_streamable:
         if allow_dataset_refresh:
@@ -180,18 +190,6 @@ def from_dataset(
     return df
 
 
-def _count_null(s: "pandas.Series") -> int:
-    """
-    Returns the number of null values in a pandas Series
-
-    Args:
-        s: pandas Series
-    Returns:
-        int
-    """
-    return s.isna().sum()
-
-
 def profile(df: "pandas.DataFrame") -> "pandas.DataFrame":
     """
     Computes profile statistics from an input DataFrame,
@@ -205,24 +203,21 @@ def profile(df: "pandas.DataFrame") -> "pandas.DataFrame":
     Returns:
         DataFrame with profile statistics
     """
-    # compute per-attribute metrics
-    # attr_metrics: aggregations that return a Series indexed by the attribute names
-    # attr_metric_names: aggregations that return a Series indexed by the attribute names
-    attr_agg_functions = OrderedDict()
-
-    # number of unique values
-    attr_agg_functions["DistinctValueCount"] = "nunique"
-
-    # number of null values
-    attr_agg_functions["EmptyValueCount"] = _count_null
-
-    # aggregate to compute per-attribute metrics
-    df_profile = df.agg(list(attr_agg_functions.values()), axis=0).T
-    # rename columns
-    df_profile.columns = attr_agg_functions.keys()
+    # This function requires pandas, an optional dependency
+    import pandas
 
-    # add summary level metrics
-    df_profile["RecordCount"] = df.shape[0]
+    # compute per-attribute metrics directly, each is a single vectorized pass over the columns
+    df_profile = pandas.DataFrame(
+        {
+            # number of unique values
+            "DistinctValueCount": df.nunique(),
+            # number of null values
+            "EmptyValueCount": df.isna().sum(),
+            # summary level metrics
+            "RecordCount": df.shape[0],
+        },
+        index=df.columns,
+    )
 
     return df_profile
 
@@ -274,15 +269,14 @@ def _check_unique_columns(
     if require_unique_columns is None:
         require_unique_columns = []
 
-    # check for unique columns
-    for col in require_unique_columns:
-        num_unique = df_profile.loc[col, "DistinctValueCount"]
-        num_records = df_profile.loc[col, "RecordCount"]
-        if not num_unique == num_records:
-            LOGGER.warning(
-                f"column {col} has only {num_unique} unique values out of {num_records} records"
-            )
-            failed_checks_dict["failed_unique_columns"].append(col)
+    # check for unique columns, comparing all required columns at once
+    unique_profile = df_profile.loc[require_unique_columns, ["DistinctValueCount", "RecordCount"]]
+    failed = unique_profile["DistinctValueCount"] != unique_profile["RecordCount"]
+    for col, num_unique, num_records in unique_profile[failed].itertuples():
+        LOGGER.warning(
+            f"column {col} has only {num_unique} unique values out of {num_records} records"
+        )
+        failed_checks_dict["failed_unique_columns"].append(col)
 
     passed = len(failed_checks_dict) == 0
     return ValidationCheck(passed, failed_checks_dict)
@@ -306,12 +300,11 @@ def _check_nonnull_columns(
     if require_nonnull_columns is None:
         require_nonnull_columns = []
 
-    # check for nonnull columns
-    for col in require_nonnull_columns:
-        num_null = df_profile.loc[col, "EmptyValueCount"]
-        if num_null > 0:
-            LOGGER.warning(f"column {col} has {num_null} null values")
-            failed_checks_dict["failed_nonnull_columns"].append(col)
+    # check for nonnull columns, comparing all required columns at once
+    null_counts = df_profile.loc[require_nonnull_columns, "EmptyValueCount"]
+    for col, num_null in null_counts[null_counts > 0].items():
+        LOGGER.warning(f"column {col} has {num_null} null values")
+        failed_checks_dict["failed_nonnull_columns"].append(col)
 
     passed = len(failed_checks_dict) == 0
     return ValidationCheck(passed, failed_checks_dict)
@@ -333,11 +326,17 @@ def _check_custom(
     """
     failed_checks_dict = defaultdict(list)
 
-    df1 = df[columns_to_check].applymap(check_function)
-    for col in columns_to_check:
-        if not df1[col].all():
-            LOGGER.warning(f"column {col} failed custom check {check_function.__name__}")
-            failed_checks_dict[f"failed custom check {check_function.__name__}"].append(col)
+    df_to_check = df[columns_to_check]
+    # DataFrame.applymap is deprecated in favour of DataFrame.map from pandas 2.1.
+    # The class is checked since a column named "map" is also an attribute of the instance
+    if hasattr(type(df_to_check), "map"):
+        passed_by_column = df_to_check.map(check_function).all(axis=0)
+    else:
+        passed_by_column = df_to_check.applymap(check_function).all(axis=0)
+
+    for col in passed_by_column.index[~passed_by_column]:
+        LOGGER.warning(f"column {col} failed custom check {check_function.__name__}")
+        failed_checks_dict[f"failed custom check {check_function.__name__}"].append(col)
 
     passed = len(failed_checks_dict) == 0
     return ValidationCheck(passed, failed_checks_dict)
@@ -375,41 +374,28 @@ def validate(
     Raises:
         ValueError: if `raise_error` is set True, and any checks fail
     """
-    failed_checks_dict = defaultdict(list)
-
-    if require_present_columns is None:
-        require_present_columns = []
-    if require_unique_columns is None:
-        require_unique_columns = []
-    if require_nonnull_columns is None:
-        require_nonnull_columns = []
-
     # compute profile stats
     df_profile = profile(df)
 
-    # check for present columns
-    failed_checks_dict.update(
-        _check_present_columns(df, require_present_columns=require_present_columns).details
-    )
-
-    # check for unique columns
-    failed_checks_dict.update(
-        _check_unique_columns(df_profile, require_unique_columns=require_unique_columns).details
-    )
-
-    # check for nonnull columns
-    failed_checks_dict.update(
-        _check_nonnull_columns(df_profile, require_nonnull_columns=require_nonnull_columns).details
-    )
-
-    for custom_check in custom_checks:
-        failed_checks_dict.update(
+    # check for present, unique and nonnull columns
+    present = _check_present_columns(df, require_present_columns=require_present_columns).details
+    unique = _check_unique_columns(
+        df_profile, require_unique_columns=require_unique_columns
+    ).details
+    nonnull = _check_nonnull_columns(
+        df_profile, require_nonnull_columns=require_nonnull_columns
+    ).details
+
+    # each custom check is keyed by the name of its function
+    custom = {}
+    for check_function, columns_to_check in custom_checks:
+        custom.update(
             _check_custom(
-                df, check_function=custom_check[0], columns_to_check=custom_check[1]
+                df, check_function=check_function, columns_to_check=columns_to_check
             ).details
         )
 
-    failed_checks_dict = dict(failed_checks_dict)
+    failed_checks_dict = {**present, **unique, **nonnull, **custom}
     passed = len(failed_checks_dict) == 0
     if not passed and raise_error:
         raise (
@@ -1,19 +1,56 @@
 """Tasks related to interacting with the Tamr auxiliary service DF-connect"""
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from base64 import b64encode
+from dataclasses import dataclass, fields
+from functools import lru_cache
 import json
 import logging
 import requests
+import time
 from enum import Enum
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tamr_toolbox.data_io.df_connect import jdbc_info
 from tamr_toolbox.models.data_type import JsonDict
 from tamr_toolbox.data_io.file_system_type import FileSystemType
-from tamr_unify_client.auth import UsernamePasswordAuth
-from typing import Dict, List, Union, Optional
+from typing import Any, Dict, List, Union, Optional
 
 LOGGER = logging.getLogger(__name__)
 
+# orjson is an optional dependency which encodes request bodies faster than the json module
+try:
+    import orjson
 
-@dataclass
+    _json_dumps = orjson.dumps
+except ModuleNotFoundError:
+    _json_dumps = json.dumps
+
+# Seconds for which a successful health check of a df_connect instance is trusted by new sessions
+_HEALTH_CHECK_TTL = 60
+# Maps the base url of each df_connect instance to the time until which it is considered healthy
+_HEALTH_CACHE: Dict[str, float] = {}
+
+# df_connect api endpoints
+_HEALTH_PATH = "/api/service/health"
+_INGEST_PATH = "/api/jdbcIngest/ingest"
+_EXECUTE_PATH = "/api/jdbcIngest/execute"
+_PROFILE_PATH = "/api/jdbcIngest/profile"
+_EXPORT_PATH = "/api/urlExport/jdbc"
+_AVRO_SCHEMA_PATH = "/api/urlExport/{fs_type}/avroSchema"
+_AVRO_PATH = "/api/urlExport/{fs_type}/avro"
+
+# File system types to which df_connect can export avro files and schemas
+_SUPPORTED_FS = frozenset({FileSystemType.LOCAL, FileSystemType.HDFS})
+
+# Prefixes of the POST endpoints which can safely be retried, since running them twice has the
+# same result as running them once. Each avro path is also a prefix of the matching avro schema
+# path. A jdbc export inserts rows into its target table, so it is not retried
+_RETRIED_POST_PATHS = (_PROFILE_PATH,) + tuple(
+    _AVRO_PATH.format(fs_type=fs_type.value) for fs_type in _SUPPORTED_FS
+)
+
+
+@dataclass(frozen=True)
 class Client:
     """A data class for interacting with df_connect via jdbc.
 
@@ -28,6 +65,21 @@ class Client:
         cert: optional path to a certfile for authentication
     """
 
+    __slots__ = (
+        "host",
+        "port",
+        "protocol",
+        "base_path",
+        "tamr_username",
+        "tamr_password",
+        "jdbc_info",
+        "cert",
+        "_ingest_template",
+        "_session",
+        "_base_url",
+        "_auth_header",
+    )
+
     host: str
     port: str
     protocol: str
@@ -37,6 +89,36 @@ class Client:
     jdbc_info: jdbc_info.JdbcInfo
     cert: Optional[str]
 
+    def __post_init__(self):
+        # The client is frozen so that the values derived from its fields below stay valid.
+        # They are not fields themselves, so they are set with object.__setattr__
+        # The queryConfig block is identical for every ingest call made with this client,
+        # so it is encoded once and spliced into each request body
+        object.__setattr__(
+            self,
+            "_ingest_template",
+            json.dumps({"queryConfig": _get_query_config(self.jdbc_info)}),
+        )
+        # The authenticated session is created and health checked on first use, then reused
+        # so that later calls keep their pooled connections to df_connect
+        object.__setattr__(self, "_session", None)
+        # Every df_connect url starts with the same protocol, host, port and base path
+        object.__setattr__(self, "_base_url", _get_base_url(self))
+        # Tamr's BasicCreds Authorization header is encoded once rather than on every request
+        object.__setattr__(
+            self, "_auth_header", _get_auth_header(self.tamr_username, self.tamr_password)
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the fields are kept. The derived values are rebuilt from them, and the session
+        # with its open connections is not shared with copies or other processes
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self.__post_init__()
+
 
 def from_config(
     config: JsonDict, config_key: str = "df_connect", jdbc_key: str = "ingest"
@@ -53,25 +135,19 @@ def from_config(
         A Client object
     """
 
-    # proxy and port redirect are optional
-    base_path = config[config_key].get("base_path", "")
-    port = config[config_key].get("port", "")
-
-    # Optional cert may or may not be present in config file (back-compat from TBOX-295)
-    if "cert" in config[config_key].keys():
-        cert = config[config_key]["cert"]
-    else:
-        cert = None
+    section = config[config_key]
 
+    # proxy and port redirect are optional
+    # cert may or may not be present in config file (back-compat from TBOX-295)
     return Client(
-        host=config[config_key]["host"],
-        port=port,
-        protocol=config[config_key]["protocol"],
-        base_path=base_path,
-        tamr_username=config[config_key]["tamr_username"],
-        tamr_password=config[config_key]["tamr_password"],
+        host=section["host"],
+        port=section.get("port", ""),
+        protocol=section["protocol"],
+        base_path=section.get("base_path", ""),
+        tamr_username=section["tamr_username"],
+        tamr_password=section["tamr_password"],
         jdbc_info=jdbc_info.from_config(config, config_key=config_key, jdbc_key=jdbc_key),
-        cert=cert,
+        cert=section.get("cert"),
     )
 
 
@@ -115,6 +191,41 @@ def create(
     )
 
 
+def _get_base_url(connect_info: Client) -> str:
+    """Constructs the part of the url shared by all requests to df_connect, from the protocol up
+    to and including the base path. Valid for both http and https.
+
+    Args:
+        connect_info: A Client object from which to pull protocol/host/port/base path
+
+    Returns:
+        base_url: A string of the url prefix, without a trailing slash
+    """
+    # handle port:
+    port = f":{connect_info.port}" if connect_info.port != "" else ""
+    # handle ssl_redirect
+    base_path = connect_info.base_path
+    if base_path != "" and not base_path.startswith("/"):
+        base_path = f"/{base_path}"
+    protocol = "https" if connect_info.protocol == "https" else "http"
+    return f"{protocol}://{connect_info.host}{port}{base_path}"
+
+
+def _get_auth_header(username: str, password: str) -> str:
+    """Encodes Tamr credentials as the value of an Authorization header, in the same
+    `BasicCreds` format as `tamr_unify_client.auth.UsernamePasswordAuth`
+
+    Args:
+        username: the tamr account to use
+        password: the password for the tamr account to use
+
+    Returns:
+        The Authorization header value
+    """
+    encoded = b64encode(f"{username}:{password}".encode("latin1"))
+    return f"BasicCreds {encoded.decode('ascii')}"
+
+
 def _get_url(connect_info: Client, api_path: str) -> str:
     """Constructs and returns url for request to df_connect. Valid for both http and https.
 
@@ -125,24 +236,14 @@ def _get_url(connect_info: Client, api_path: str) -> str:
     Returns:
         url: A string of the request url formatted correctly for that instance of df_connect.
     """
-    # handle port:
-    if connect_info.port != "":
-        port = ":" + connect_info.port
-    else:
-        port = connect_info.port
-    # handle ssl_redirect
-    api_path = "/".join([connect_info.base_path, api_path.lstrip("/")])
-    api_path = api_path if api_path.startswith("/") else ("/" + api_path)
-    if connect_info.protocol == "https":
-        url = "https://" + connect_info.host + port + api_path
-    else:
-        url = "http://" + connect_info.host + port + api_path
-    return url
+    return f"{connect_info._base_url}/{api_path.lstrip('/')}"
 
 
+@lru_cache(maxsize=16)
 def _get_query_config(jdbc_info: jdbc_info.JdbcInfo) -> Dict:
     """Packages configuration info into relevant query configuration json (dict) which is used
     for multiple df_connect API calls.
+    The dictionary is cached per JdbcInfo and shared between calls, so it must not be modified.
 
     Args:
         jdbc_info: JdbcInfo object from which to construct the query configuration.
@@ -190,20 +291,62 @@ def _get_export_config(
     return export_config
 
 
-def _get_avro_url_export_config(url: str, dataset_name: str) -> JsonDict:
-    """Generates json needed for using avro(schema) export endpoints.
-    Primary key is always set to [] since needing it is an artifact of the df-connect endpoint
+def _get_ingest_body(
+    connect_info: Client, *, query: str, dataset_name: str, primary_key: List[str]
+) -> str:
+    """Builds the json body for the jdbc ingest endpoint. Only the query, dataset name and
+    primary key are encoded per call, the queryConfig is taken from the client's pre-encoded
+    template. The result is identical to `json.dumps` of the full ingest dictionary.
 
     Args:
-        url: the url to which the avro(schema) will be written
-        dataset_name: the dataset for which the avro(schema) will be written
+        connect_info: A Client object from which to take the pre-encoded queryConfig
+        query: jdbc query to execute in the database
+        dataset_name: Name of dataset
+        primary_key: list of columns to use as primary key
+
+    Returns:
+        The encoded request body
     """
-    return {"url": url, "datasetName": dataset_name, "primaryKey": []}
+    return (
+        f'{{"query": {json.dumps(query)}, "datasetName": {json.dumps(dataset_name)}, '
+        f'"primaryKey": {json.dumps(primary_key)}, {connect_info._ingest_template[1:]}'
+    )
+
+
+def _make_adapter(retried_methods: frozenset) -> HTTPAdapter:
+    """Creates an adapter which retries gateway errors for the given HTTP methods
+
+    Once retries are exhausted the last response is returned, so that `raise_for_status`
+    still surfaces the HTTPError
+
+    Args:
+        retried_methods: the HTTP methods to retry
+
+    Returns:
+        The adapter
+    """
+    # `method_whitelist` was renamed to `allowed_methods` in urllib3 1.26
+    if hasattr(Retry, "DEFAULT_ALLOWED_METHODS"):
+        methods = {"allowed_methods": retried_methods}
+    else:
+        methods = {"method_whitelist": retried_methods}
+    retry = Retry(
+        total=5,
+        connect=0,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+        **methods,
+    )
+    return HTTPAdapter(pool_connections=1, pool_maxsize=64, max_retries=retry)
 
 
 def get_connect_session(connect_info: Client) -> requests.Session:
     """Returns an authenticated session using Tamr credentials from configuration.
     Raises an exception if df_connect is not installed or running correctly.
+    The session is created and health checked once per client, later calls reuse it. The health
+    check is skipped if the same df_connect instance passed one within the last minute.
 
     Args:
         connect_info: An instance of a Client object
@@ -214,29 +357,51 @@ def get_connect_session(connect_info: Client) -> requests.Session:
     Raises:
         RuntimeError: if a connection to df_connect cannot be established
     """
-    auth = UsernamePasswordAuth(connect_info.tamr_username, connect_info.tamr_password)
+    if connect_info._session is not None:
+        return connect_info._session
+
     s = requests.Session()
-    s.auth = auth
+    s.headers.update({"Authorization": connect_info._auth_header})
     s.headers.update({"Content-type": "application/json"})
     s.headers.update({"Accept": "application/json"})
     s.cert = connect_info.cert
 
-    # test that df_connect is running properly
-    url = _get_url(connect_info, "/api/service/health")
-    try:
-        r = s.get(url)
-        r.raise_for_status()
-    except (requests.exceptions.ConnectionError, requests.exceptions.HTTPError):
-        raise RuntimeError(
-            f"Tamr auxiliary service df-df_connect is either not running or not healthy at {url}!"
-            f" Did you install it? Df-connect does not come with default Tamr installation."
-            f" Check its status and your configuration."
-        )
+    # retry transient gateway errors in urllib3 rather than failing the whole call.
+    # Only the health check and the POSTs that can safely run twice are retried: a gateway
+    # error on an ingest or a user's statement does not mean df_connect stopped running it
+    # df_connect is a single host, so one pool per adapter is enough, but it must hold a
+    # connection for each concurrent call, e.g. from `profile_query_results` with `parallel`
+    # greater than 1
+    s.mount("http://", _make_adapter(frozenset({"GET"})))
+    s.mount("https://", _make_adapter(frozenset({"GET"})))
+    for api_path in _RETRIED_POST_PATHS:
+        # requests uses the adapter with the longest matching prefix
+        s.mount(_get_url(connect_info, api_path), _make_adapter(frozenset({"GET", "POST"})))
+
+    # test that df_connect is running properly, unless it was found healthy recently
+    base_url = connect_info._base_url
+    if time.monotonic() >= _HEALTH_CACHE.get(base_url, 0.0):
+        url = _get_url(connect_info, _HEALTH_PATH)
+        try:
+            r = s.get(url)
+            r.raise_for_status()
+        except (requests.exceptions.ConnectionError, requests.exceptions.HTTPError):
+            raise RuntimeError(
+                f"Tamr auxiliary service df-df_connect is either not running or not healthy at "
+                f"{url}! Did you install it? Df-connect does not come with default Tamr "
+                f"installation. Check its status and your configuration."
+            )
+        _HEALTH_CACHE[base_url] = time.monotonic() + _HEALTH_CHECK_TTL
+    object.__setattr__(connect_info, "_session", s)
     return s
 
 
 def ingest_dataset(
-    connect_info: Client, *, dataset_name: str, query: str, primary_key=None
+    connect_info: Client,
+    *,
+    dataset_name: str,
+    query: str,
+    primary_key: Union[str, List[str], None] = None,
 ) -> JsonDict:
     """
     Ingest a dataset into Tamr via df-df_connect given dataset name, query string, and optional
@@ -246,8 +411,8 @@ def ingest_dataset(
         dataset_name: Name of dataset
         query: jdbc query to execute in the database and results of which will be loaded into Tamr
         connect_info: A Client object for establishing session and loading jdbc parameters
-        primary_key: list of columns to use as primary key. If None then df_connect will generate
-            its own primary key
+        primary_key: columns to use as primary key, either as a list or as a comma-separated
+            string. If None then df_connect will generate its own primary key
 
     Returns:
         JSON response from API call
@@ -258,27 +423,24 @@ def ingest_dataset(
     # handle primary key
     if primary_key is None:
         primary_key = []
-    else:
+    elif isinstance(primary_key, str):
         primary_key = primary_key.split(",")
+    else:
+        primary_key = list(primary_key)
 
     # establish a df_connect session
     connect_session = get_connect_session(connect_info)
 
     # ingest data
-    api_path = "/api/jdbcIngest/ingest"
-    query_config = _get_query_config(connect_info.jdbc_info)
-    ingest_data = {
-        "query": query,
-        "datasetName": dataset_name,
-        "primaryKey": primary_key,
-        "queryConfig": query_config,
-    }
-    ingest_url = _get_url(connect_info, api_path)
+    ingest_data = _get_ingest_body(
+        connect_info, query=query, dataset_name=dataset_name, primary_key=primary_key
+    )
+    ingest_url = _get_url(connect_info, _INGEST_PATH)
     LOGGER.info(
         f"Streaming data from {connect_info.jdbc_info.jdbc_url} to "
         f"Tamr with the following query: \n\t{query}"
     )
-    r = connect_session.post(ingest_url, data=json.dumps(ingest_data))
+    r = connect_session.post(ingest_url, data=ingest_data)
 
     # check if successful and if so return True
     r.raise_for_status()
@@ -314,7 +476,6 @@ def export_dataset(
     connect_session = get_connect_session(connect_info)
 
     # export data
-    api_path = "/api/urlExport/jdbc"
     query_config = _get_query_config(connect_info.jdbc_info)
     export_data_config = _get_export_config(**kwargs)
     export_data = {
@@ -325,12 +486,12 @@ def export_dataset(
         "targetTableName": target_table_name,
     }
 
-    export_url = _get_url(connect_info, api_path)
+    export_url = _get_url(connect_info, _EXPORT_PATH)
     LOGGER.info(
         f"Streaming data to {connect_info.jdbc_info.jdbc_url} from this "
         f"Tamr dataset: \n\t{dataset_name}"
     )
-    r = connect_session.post(export_url, data=json.dumps(export_data))
+    r = connect_session.post(export_url, data=_json_dumps(export_data))
     r.raise_for_status()
     return r.json()
 
@@ -356,20 +517,19 @@ def execute_statement(connect_info: Client, statement: str) -> JsonDict:
     query_config = _get_query_config(connect_info.jdbc_info)
 
     # export data
-    api_path = "/api/jdbcIngest/execute"
     execute_data = {"queryConfig": query_config, "statement": statement}
-    execute_url = _get_url(connect_info, api_path)
+    execute_url = _get_url(connect_info, _EXECUTE_PATH)
     LOGGER.info(
         f"Execute statement {statement} using the following jdbc url {query_config['jdbcUrl']}"
     )
-    r = connect_session.post(execute_url, data=json.dumps(execute_data))
+    r = connect_session.post(execute_url, data=_json_dumps(execute_data))
     r.raise_for_status()
     return r.json()
 
 
 def profile_query_results(
-    connect_info: Client, *, dataset_name: str, queries: List[str]
-) -> JsonDict:
+    connect_info: Client, *, dataset_name: str, queries: List[str], parallel: int = 1
+) -> Union[JsonDict, List[JsonDict]]:
     """
     Profile the contents of JDBC queries via df_connect and write results to a Tamr dataset.
     For example the query "select * from table A" means that all rows from table A will be
@@ -382,9 +542,14 @@ def profile_query_results(
         queries: list of JDBC queries to execute in the database, the results of which will be
             profiled
         connect_info: A Client object for establishing session and loading jdbc parameters
+        parallel: number of queries to profile concurrently. If 1, all queries are profiled in
+            a single call to df_connect. If greater than 1, each query is profiled in its own
+            call. The first query is profiled alone, then up to `parallel` calls run at the same
+            time for the rest
 
     Returns:
-        JSON response from API call
+        JSON response from API call. If `parallel` is greater than 1, a list of the JSON
+        responses to the call for each query, in the order of `queries`
 
     Raises:
         HTTPError: if the call to profile the dataset was unsuccessful
@@ -396,25 +561,38 @@ def profile_query_results(
     connect_session = get_connect_session(connect_info)
 
     # run profiling
-    api_path = "/api/jdbcIngest/profile"
     query_config = _get_query_config(connect_info.jdbc_info)
-    profile_data = {
-        "queryTargetList": [
-            {"query": query, "datasetName": dataset_name, "primaryKey": primary_key}
-            for query in queries
-        ],
-        "queryConfig": query_config,
-    }
-    profile_url = _get_url(connect_info, api_path)
+    profile_url = _get_url(connect_info, _PROFILE_PATH)
     LOGGER.info(
         f"Profiling data from {connect_info.jdbc_info.jdbc_url} to Tamr with the "
         f"following queries: \n\t{queries}"
     )
-    r = connect_session.post(profile_url, data=json.dumps(profile_data))
 
-    # check if successful, and if so, return request JSON
-    r.raise_for_status()
-    return r.json()
+    def _profile(queries_to_profile: List[str]) -> JsonDict:
+        profile_data = {
+            "queryTargetList": [
+                {"query": query, "datasetName": dataset_name, "primaryKey": primary_key}
+                for query in queries_to_profile
+            ],
+            "queryConfig": query_config,
+        }
+        r = connect_session.post(profile_url, data=_json_dumps(profile_data))
+
+        # check if successful, and if so, return request JSON
+        r.raise_for_status()
+        return r.json()
+
+    if parallel <= 1:
+        return _profile(queries)
+
+    # the first call creates the results dataset if it does not exist yet, so it is made alone
+    # to keep the concurrent calls from racing to create it
+    responses = [_profile(queries[:1])]
+    # profiling is bound by df_connect and the database, so the remaining calls are overlapped in
+    # threads sharing the client's session
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        responses.extend(executor.map(_profile, ([query] for query in queries[1:])))
+    return responses
 
 
 def export_dataset_avro_schema(
@@ -437,24 +615,22 @@ def export_dataset_avro_schema(
         HTTPError: if the call to export the schema was unsuccessful
     """
 
-    if fs_type == FileSystemType.LOCAL:
-        api_path = f"/api/urlExport/{fs_type.value}/avroSchema"
-    elif fs_type == FileSystemType.HDFS:
-        api_path = f"/api/urlExport/{fs_type.value}/avroSchema"
-    else:
+    if fs_type not in _SUPPORTED_FS:
         error = (
             f"trying to use unsupported type {fs_type}, supported are "
             f"'{FileSystemType.LOCAL.value}' and '{FileSystemType.HDFS.value}'"
         )
         LOGGER.error(error)
         raise ValueError(error)
+    api_path = _AVRO_SCHEMA_PATH.format(fs_type=fs_type.value)
 
-    url_export_config = _get_avro_url_export_config(url, dataset_name)
+    # primary key is always set to [] since needing it is an artifact of the df-connect endpoint
+    url_export_config = {"url": url, "datasetName": dataset_name, "primaryKey": []}
 
     # establish a df_connect session and make API call
     connect_session = get_connect_session(connect_info)
     url = _get_url(connect_info, api_path)
-    r = connect_session.post(url, data=json.dumps(url_export_config))
+    r = connect_session.post(url, data=_json_dumps(url_export_config))
     r.raise_for_status()
     return r.json()
 
@@ -481,23 +657,21 @@ def export_dataset_as_avro(
         HTTPError: if the call to export the dataset was unsuccessful
     """
 
-    if fs_type == FileSystemType.LOCAL:
-        api_path = f"/api/urlExport/{fs_type.value}/avro"
-    elif fs_type == FileSystemType.HDFS:
-        api_path = f"/api/urlExport/{fs_type.value}/avro"
-    else:
+    if fs_type not in _SUPPORTED_FS:
         error = (
             f"trying to use unsupported type {fs_type}, supported are "
             f"'{FileSystemType.LOCAL.value}' and '{FileSystemType.HDFS.value}'"
         )
         LOGGER.error(error)
         raise ValueError(error)
+    api_path = _AVRO_PATH.format(fs_type=fs_type.value)
 
-    url_export_config = _get_avro_url_export_config(url, dataset_name)
+    # primary key is always set to [] since needing it is an artifact of the df-connect endpoint
+    url_export_config = {"url": url, "datasetName": dataset_name, "primaryKey": []}
 
     # establish a df_connect session and make API call
     connect_session = get_connect_session(connect_info)
     url = _get_url(connect_info, api_path)
-    r = connect_session.post(url, data=json.dumps(url_export_config))
+    r = connect_session.post(url, data=_json_dumps(url_export_config))
     r.raise_for_status()
     return r.json()
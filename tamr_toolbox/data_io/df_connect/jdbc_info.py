@@ -1,9 +1,10 @@
 """Tasks related to handling jdbc information for the Tamr auxiliary service DF-connect"""
 from dataclasses import dataclass
+from typing import Any, Dict
 from tamr_toolbox.models.data_type import JsonDict
 
 
-@dataclass
+@dataclass(frozen=True)
 class JdbcInfo:
     """
     A dataclass to tie together relevant data to ingest data into df_connect.
@@ -15,11 +16,21 @@ class JdbcInfo:
         fetch_size: The number of records by which to chunk the jdbc ResultSet
     """
 
+    __slots__ = ("jdbc_url", "db_user", "db_password", "fetch_size")
+
     jdbc_url: str
     db_user: str
     db_password: str
     fetch_size: int
 
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # The instance is frozen, so copies and unpickled instances set their fields directly
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
 
 def from_config(
     config: JsonDict, *, config_key: str = "df_connect", jdbc_key: str = "ingest"
@@ -48,10 +48,11 @@ def get_profile(dataset: Dataset, allow_create_or_refresh: bool = False) -> Data
             profile = dataset.profile()
         else:
             # Return profile information with a staleness warning:
-            print(
-                f"WARNING: Profile information for {dataset.name} is out-of-date "
-                f"and allow_create_or_refresh is False. If you would like an up-to-date "
-                f"profile, rerun with allow_create_or_refresh set to True."
+            LOGGER.warning(
+                "Profile information for %s is out-of-date and allow_create_or_refresh is "
+                "False. If you would like an up-to-date profile, rerun with "
+                "allow_create_or_refresh set to True.",
+                dataset.name,
             )
 
     return profile
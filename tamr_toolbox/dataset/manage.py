@@ -1,7 +1,11 @@
-from typing import List, Optional, Dict, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Optional, Dict, Iterable
 import logging
 
+from requests.exceptions import HTTPError
 from tamr_unify_client import Client
+from tamr_unify_client.attribute.resource import Attribute
 from tamr_unify_client.dataset.resource import Dataset
 from tamr_toolbox.models import attribute_type
 
@@ -22,12 +26,27 @@ def exists(*, client: Client, dataset_name: str) -> bool:
         True or False for if the dataset exists in target instance
     """
 
-    try:
-        client.datasets.by_name(dataset_name)
-    except KeyError:
-        return False
+    return _find(client=client, dataset_name=dataset_name) is not None
+
+
+def _find(*, client: Client, dataset_name: str) -> Optional[Dataset]:
+    """
+    Fetch a dataset by name from a Tamr instance, if it exists
+
+    Args:
+        client: Tamr python client object for the target instance
+        dataset_name: The dataset name
 
-    return True
+    Return:
+        The dataset, or None if it does not exist in the target instance
+    """
+    # Unlike `client.datasets.by_name`, ask Tamr to filter the datasets by name rather than
+    # downloading the specs of every dataset in the instance
+    response = client.get(client.datasets.api_path, params={"filter": f"name=={dataset_name}"})
+    for dataset_json in response.successful().json():
+        if dataset_json["name"] == dataset_name:
+            return Dataset.from_json(client, dataset_json)
+    return None
 
 
 def create(
@@ -42,6 +61,7 @@ def create(
     description: Optional[str] = None,
     external_id: Optional[str] = None,
     tags: Optional[List[str]] = None,
+    max_workers: int = 1,
 ) -> Dataset:
     """Flexibly create a source dataset in Tamr
 
@@ -65,6 +85,7 @@ def create(
         description: description of the new dataset
         external_id: external_id for dataset, if None Tamr will create one for you
         tags: the list of tags for the new dataset
+        max_workers: maximum number of attributes to create concurrently
 
     Returns:
         Dataset created in Tamr
@@ -106,31 +127,42 @@ def create(
     # Check input type is correct
     if attributes and not isinstance(attributes, Iterable):
         raise TypeError("attributes arg must be an Iterable")
-
-    if not exists(client=client, dataset_name=dataset_name):
-        creation_spec = {
-            "name": dataset_name,
-            "description": description,
-            "keyAttributeNames": primary_keys,
-            "externalId": external_id,
-            "tags": tags,
-        }
-        client.datasets.create(creation_spec)
-        LOGGER.info(f"A dataset with name {dataset_name} has been created")
-    else:
-        raise ValueError(f"A dataset with name '{dataset_name}' already exists")
-
-    # Get new dataset
-    target_dataset = client.datasets.by_name(dataset_name)
-
-    # Update attributes in dataset
+    # Materialize the arguments once so that generators are neither exhausted by the first pass
+    # nor serialized as-is into the creation spec
+    attributes = list(attributes) if attributes else []
+    primary_keys = list(primary_keys)
+    if tags is not None:
+        tags = list(tags)
+
+    creation_spec = {
+        "name": dataset_name,
+        "description": description,
+        "keyAttributeNames": primary_keys,
+        "externalId": external_id,
+        "tags": tags,
+    }
+    # Tamr rejects a dataset name which is already in use with 409 Conflict, so the name is not
+    # checked beforehand. The creation response describes the new dataset, so there is no need
+    # to fetch it by name
+    try:
+        target_dataset = client.datasets.create(creation_spec)
+    except HTTPError as exp:
+        if exp.response is not None and exp.response.status_code == 409:
+            raise ValueError(f"A dataset with name '{dataset_name}' already exists") from exp
+        raise
+    LOGGER.info(f"A dataset with name {dataset_name} has been created")
+
+    # Update attributes in dataset. The new source dataset only has its primary key attributes,
+    # so the checks made by `create_attributes` are not needed
     if attributes:
-        filtered_attributes = [attr for attr in attributes if attr not in primary_keys]
-        create_attributes(
+        primary_key_set = set(primary_keys)
+        filtered_attributes = [attr for attr in attributes if attr not in primary_key_set]
+        _create_attributes(
             dataset=target_dataset,
             attributes=filtered_attributes,
             attribute_types=attribute_types,
             attribute_descriptions=attribute_descriptions,
+            max_workers=max_workers,
         )
 
     return target_dataset
@@ -145,6 +177,7 @@ def update(
     description: Optional[str] = None,
     tags: Optional[List[str]] = None,
     override_existing_types: bool = False,
+    max_workers: int = 1,
 ) -> Dataset:
     """Flexibly update a source dataset in Tamr
 
@@ -167,6 +200,7 @@ def update(
         description: updated description of dataset, if None will not update the description
         tags: updated tags for the dataset, if None will not update tags
         override_existing_types: boolean flag, when true will alter existing attribute's types
+        max_workers: maximum number of attributes to create, edit or delete concurrently
 
     Returns:
         Updated Dataset
@@ -192,61 +226,102 @@ def update(
     dataset_name = dataset.name
     if dataset.upstream_datasets():
         raise ValueError(f"{dataset_name} is not a source dataset")
-    primary_keys = dataset.spec().to_dict()["keyAttributeNames"]
+    primary_keys = set(dataset.key_attribute_names)
 
     # Check input type is correct
     if attributes and not isinstance(attributes, Iterable):
         raise TypeError("attributes arg must be an Iterable")
 
-    # Update description and tags
+    # Update description and tags, skipping the call when neither is changed
     dataset_spec = dataset.spec()
-    if description:
+    spec_changed = False
+    if description and description != dataset.description:
         dataset_spec = dataset_spec.with_description(description)
+        spec_changed = True
         LOGGER.info(f"Updating description for {dataset_name}")
-    if tags:
+    if tags and tags != dataset.tags:
         dataset_spec = dataset_spec.with_tags(tags)
+        spec_changed = True
         LOGGER.info(f"Updating tags for {dataset_name}")
 
-    dataset_spec.put()
+    if spec_changed:
+        dataset_spec.put()
 
     if attributes:
+        attributes = list(attributes)
         # Get current dataset attributes
-        existing_attributes = [attr.name for attr in dataset.attributes]
-
-        # Update attributes in dataset
+        existing_attribute_dict = {attr.name: attr for attr in dataset.attributes}
+        existing_attributes = list(existing_attribute_dict)
+        existing_attribute_set = set(existing_attributes)
+        attribute_set = set(attributes)
+
+        # Work out the attribute changes, then make them. The dataset has already been checked
+        # and its attributes fetched, so the private helpers are used to avoid fetching them again
+        attributes_to_edit, attributes_to_create = [], []
+        edit_types, edit_descriptions = {}, {}
         for attribute_name in attributes:
             if attribute_name in primary_keys:
                 continue
-            elif attribute_name in existing_attributes:
+            elif attribute_name in existing_attribute_set:
                 # This attribute already exists, update to new type
-                type_dict = {
-                    attribute_name: (attribute_types or dict()).get(
-                        attribute_name, attribute_type.DEFAULT
+                new_type = (attribute_types or dict()).get(attribute_name, attribute_type.DEFAULT)
+                new_description = (attribute_descriptions or dict()).get(attribute_name)
+
+                # Compare with the current spec locally and skip the calls if nothing changes.
+                # Tamr stores a missing description as an empty string
+                existing_attribute = existing_attribute_dict[attribute_name]
+                # Only the type is copied, not the whole attribute spec
+                existing_type = attribute_type.from_json(existing_attribute.type.spec().to_dict())
+                existing_description = existing_attribute.description or ""
+                if existing_type == new_type and existing_description == (new_description or ""):
+                    LOGGER.info(
+                        f"There are no updates to the attribute '{attribute_name}' in "
+                        f"{dataset_name}"
                     )
-                }
-                desc_dict = {
-                    attribute_name: (attribute_descriptions or dict()).get(attribute_name)
-                }
-
-                edit_attributes(
-                    dataset=dataset,
-                    attribute_types=type_dict,
-                    attribute_descriptions=desc_dict,
-                    override_existing_types=override_existing_types,
-                )
+                    continue
+
+                attributes_to_edit.append(attribute_name)
+                edit_types[attribute_name] = new_type
+                edit_descriptions[attribute_name] = new_description
             else:
                 # This attribute does not already exist, create
-                create_attributes(
-                    dataset=dataset,
-                    attributes=[attribute_name],
-                    attribute_types=attribute_types,
-                    attribute_descriptions=attribute_descriptions,
-                )
+                attributes_to_create.append(attribute_name)
+
+        if attributes_to_edit:
+            _edit_attributes(
+                dataset=dataset,
+                attributes=attributes_to_edit,
+                target_attribute_dict=existing_attribute_dict,
+                attribute_types=edit_types,
+                attribute_descriptions=edit_descriptions,
+                override_existing_types=override_existing_types,
+                max_workers=max_workers,
+            )
+        if attributes_to_create:
+            _create_attributes(
+                dataset=dataset,
+                attributes=attributes_to_create,
+                attribute_types=attribute_types,
+                attribute_descriptions=attribute_descriptions,
+                max_workers=max_workers,
+            )
 
         # Remove any attributes from dataset that aren't in the new list of attributes
-        for attribute_name in existing_attributes:
-            if attribute_name not in attributes and attribute_name not in primary_keys:
-                delete_attributes(dataset=dataset, attributes=[attribute_name])
+        attributes_to_remove = [
+            attribute_name
+            for attribute_name in existing_attributes
+            if attribute_name not in attribute_set and attribute_name not in primary_keys
+        ]
+        if attributes_to_remove:
+            _delete_attributes(
+                dataset=dataset,
+                attributes=attributes_to_remove,
+                attribute_resource_ids={
+                    attribute_name: existing_attribute_dict[attribute_name].resource_id
+                    for attribute_name in attributes_to_remove
+                },
+                max_workers=max_workers,
+            )
 
     return dataset
 
@@ -257,6 +332,7 @@ def create_attributes(
     attributes: Iterable[str],
     attribute_types: Optional[Dict[str, attribute_type.AttributeType]] = None,
     attribute_descriptions: Optional[Dict[str, str]] = None,
+    max_workers: int = 1,
 ) -> Dataset:
     """Create new attributes in a dataset
 
@@ -271,6 +347,7 @@ def create_attributes(
             AttributeType is the value
         attribute_descriptions: dictionary for attribute descriptions, attribute name is the
             key and the attribute description is the value
+        max_workers: maximum number of attributes to create concurrently
 
     Returns:
         Updated Dataset
@@ -289,9 +366,10 @@ def create_attributes(
     # Check input type is correct
     if not isinstance(attributes, Iterable):
         raise TypeError("attributes arg must be an Iterable")
+    attributes = list(attributes)
 
     # Get current dataset attributes
-    existing_attributes = [attr.name for attr in dataset.attributes]
+    existing_attributes = {attr.name for attr in dataset.attributes}
 
     # Check that none of the new attribute names already exist
     for attribute_name in attributes:
@@ -302,7 +380,41 @@ def create_attributes(
             )
 
     # Add attributes to dataset
-    for attribute_name in attributes:
+    return _create_attributes(
+        dataset=dataset,
+        attributes=attributes,
+        attribute_types=attribute_types,
+        attribute_descriptions=attribute_descriptions,
+        max_workers=max_workers,
+    )
+
+
+def _create_attributes(
+    *,
+    dataset: Dataset,
+    attributes: List[str],
+    attribute_types: Optional[Dict[str, attribute_type.AttributeType]] = None,
+    attribute_descriptions: Optional[Dict[str, str]] = None,
+    max_workers: int = 1,
+) -> Dataset:
+    """Create new attributes in a dataset, without checking the dataset or attributes first.
+    See `create_attributes` for details
+
+    Args:
+        dataset: An existing TUC source dataset
+        attributes: list of attribute names, not already in the dataset, to be added to dataset
+        attribute_types: dictionary for non-default types, attribute name is the key and
+            AttributeType is the value
+        attribute_descriptions: dictionary for attribute descriptions, attribute name is the
+            key and the attribute description is the value
+        max_workers: maximum number of attributes to create concurrently
+
+    Returns:
+        Updated Dataset
+    """
+    dataset_name = dataset.name
+
+    def _create(attribute_name: str) -> None:
         attr_spec_dict = _make_spec_dict(
             attribute_name=attribute_name,
             attribute_types=attribute_types,
@@ -311,6 +423,8 @@ def create_attributes(
         dataset.attributes.create(attr_spec_dict)
         LOGGER.info(f"Created attribute '{attribute_name}' in {dataset_name}")
 
+    _run_each(_create, attributes, max_workers=max_workers)
+
     return dataset
 
 
@@ -320,6 +434,7 @@ def edit_attributes(
     attribute_types: Optional[Dict[str, attribute_type.AttributeType]] = None,
     attribute_descriptions: Optional[Dict[str, str]] = None,
     override_existing_types: bool = True,
+    max_workers: int = 1,
 ) -> Dataset:
     """Edit existing attributes in a dataset
 
@@ -337,6 +452,7 @@ def edit_attributes(
         attribute_descriptions: dictionary for attribute descriptions, attribute name is the
             key and the attribute description is the value
         override_existing_types: bool flag, when true will alter existing attributes
+        max_workers: maximum number of attributes to edit concurrently
 
     Returns:
         Updated Dataset
@@ -368,12 +484,11 @@ def edit_attributes(
 
     # Get current dataset attributes
     target_attribute_dict = {attr.name: attr for attr in dataset.attributes}
-    existing_attributes = target_attribute_dict.keys()
-    primary_keys = dataset.spec().to_dict()["keyAttributeNames"]
+    primary_keys = set(dataset.key_attribute_names)
 
     # Check that all of the attribute names already exist in dataset
     for attribute_name in attributes:
-        if attribute_name not in existing_attributes:
+        if attribute_name not in target_attribute_dict:
             # This attribute does not exist
             raise ValueError(
                 f"An attribute with name '{attribute_name}' does not exist in {dataset_name}"
@@ -385,24 +500,64 @@ def edit_attributes(
             )
 
     # Update attributes in dataset
-    for attribute_name in attributes:
-        attr_spec_dict = _make_spec_dict(
-            attribute_name=attribute_name,
-            attribute_types=attribute_types,
-            attribute_descriptions=attribute_descriptions,
-        )
+    return _edit_attributes(
+        dataset=dataset,
+        attributes=attributes,
+        target_attribute_dict=target_attribute_dict,
+        attribute_types=attribute_types,
+        attribute_descriptions=attribute_descriptions,
+        override_existing_types=override_existing_types,
+        max_workers=max_workers,
+    )
+
+
+def _edit_attributes(
+    *,
+    dataset: Dataset,
+    attributes: Iterable[str],
+    target_attribute_dict: Dict[str, Attribute],
+    attribute_types: Optional[Dict[str, attribute_type.AttributeType]] = None,
+    attribute_descriptions: Optional[Dict[str, str]] = None,
+    override_existing_types: bool = True,
+    max_workers: int = 1,
+) -> Dataset:
+    """Edit existing attributes in a dataset, without checking the dataset or attributes first.
+    See `edit_attributes` for details
+
+    Args:
+        dataset: An existing TUC source dataset
+        attributes: names of the existing, non primary key, attributes to update
+        target_attribute_dict: current attributes of the dataset, by name
+        attribute_types: dictionary for non-default types, attribute name is the key and
+            AttributeType is the value
+        attribute_descriptions: dictionary for attribute descriptions, attribute name is the
+            key and the attribute description is the value
+        override_existing_types: bool flag, when true will alter existing attributes
+        max_workers: maximum number of attributes to edit concurrently
+
+    Returns:
+        Updated Dataset
+    """
+    dataset_name = dataset.name
+
+    def _edit(attribute_name: str) -> None:
+        # Serialize the existing spec once, it is needed for the comparison and the update
         existing_attribute_spec = target_attribute_dict[attribute_name].spec()
+        existing_spec_dict = existing_attribute_spec.to_dict()
+        old_type_class = attribute_type.from_json(existing_spec_dict["type"])
         if attribute_types is None or attribute_name not in attribute_types:
-            new_type_class = attribute_type.from_json(existing_attribute_spec.to_dict()["type"])
+            new_type_class = old_type_class
         else:
-            new_type_class = attribute_type.from_json(attr_spec_dict["type"])
-        old_type_class = attribute_type.from_json(existing_attribute_spec.to_dict()["type"])
+            new_type_class = attribute_types[attribute_name]
 
         if new_type_class == old_type_class:
-            # Update description
+            # Update description, unless it is unchanged. Tamr stores a missing description as
+            # an empty string
             if (
                 attribute_descriptions is not None
-                and attribute_name in attribute_descriptions.keys()
+                and attribute_name in attribute_descriptions
+                and (attribute_descriptions[attribute_name] or "")
+                != (existing_spec_dict.get("description") or "")
             ):
                 existing_attribute_spec = existing_attribute_spec.with_description(
                     attribute_descriptions[attribute_name]
@@ -414,12 +569,11 @@ def edit_attributes(
                 )
         elif override_existing_types:
             # Update type
-            new_attr_spec = existing_attribute_spec.to_dict()
-            new_attr_spec["type"] = attr_spec_dict["type"]
+            new_attr_spec = {**existing_spec_dict, "type": _type_json(new_type_class)}
 
             # Update description
-            if "description" in attr_spec_dict.keys():
-                new_attr_spec["description"] = attr_spec_dict["description"]
+            if attribute_descriptions is not None and attribute_name in attribute_descriptions:
+                new_attr_spec["description"] = attribute_descriptions[attribute_name]
 
             # Remove and add attribute with new spec
             dataset.attributes.delete_by_resource_id(
@@ -435,15 +589,20 @@ def edit_attributes(
                 """
             )
 
+    _run_each(_edit, list(attributes), max_workers=max_workers)
+
     return dataset
 
 
-def delete_attributes(*, dataset: Dataset, attributes: Iterable[str] = None) -> Dataset:
+def delete_attributes(
+    *, dataset: Dataset, attributes: Iterable[str] = None, max_workers: int = 1
+) -> Dataset:
     """Remove attributes from dataset by attribute name
 
     Args:
         dataset: An existing TUC dataset
         attributes: list of attribute names to delete from dataset
+        max_workers: maximum number of attributes to delete concurrently
 
     Returns:
         Updated Dataset
@@ -461,15 +620,15 @@ def delete_attributes(*, dataset: Dataset, attributes: Iterable[str] = None) ->
     # Check input type is correct
     if not isinstance(attributes, Iterable):
         raise TypeError("attributes arg must be an Iterable")
+    attributes = list(attributes)
 
-    # Get current dataset attributes
-    target_attribute_dict = {attr.name: attr for attr in dataset.attributes}
-    existing_attributes = target_attribute_dict.keys()
-    primary_keys = dataset.spec().to_dict()["keyAttributeNames"]
+    # Get current dataset attributes, only the resource ids are needed to remove them
+    attribute_resource_ids = {attr.name: attr.resource_id for attr in dataset.attributes}
+    primary_keys = set(dataset.key_attribute_names)
 
     # Check all attributes exist before starting to remove any
     for attribute_name in attributes:
-        if attribute_name not in existing_attributes:
+        if attribute_name not in attribute_resource_ids:
             raise ValueError(f"The attribute '{attribute_name}' does not exist in {dataset_name}")
         elif attribute_name in primary_keys:
             # Can not edit a primary key
@@ -478,10 +637,41 @@ def delete_attributes(*, dataset: Dataset, attributes: Iterable[str] = None) ->
             )
 
     # Remove attributes from dataset
-    for attribute_name in attributes:
-        dataset.attributes.delete_by_resource_id(target_attribute_dict[attribute_name].resource_id)
+    return _delete_attributes(
+        dataset=dataset,
+        attributes=attributes,
+        attribute_resource_ids=attribute_resource_ids,
+        max_workers=max_workers,
+    )
+
+
+def _delete_attributes(
+    *,
+    dataset: Dataset,
+    attributes: List[str],
+    attribute_resource_ids: Dict[str, str],
+    max_workers: int = 1,
+) -> Dataset:
+    """Remove attributes from dataset by attribute name, without checking the dataset or
+    attributes first. See `delete_attributes` for details
+
+    Args:
+        dataset: An existing TUC source dataset
+        attributes: names of the existing, non primary key, attributes to delete from dataset
+        attribute_resource_ids: resource ids of the dataset's attributes, by name
+        max_workers: maximum number of attributes to delete concurrently
+
+    Returns:
+        Updated Dataset
+    """
+    dataset_name = dataset.name
+
+    def _delete(attribute_name: str) -> None:
+        dataset.attributes.delete_by_resource_id(attribute_resource_ids[attribute_name])
         LOGGER.info(f"Deleted attribute '{attribute_name}' in {dataset_name}")
 
+    _run_each(_delete, attributes, max_workers=max_workers)
+
     return dataset
 
 
@@ -531,7 +721,7 @@ def update_records(
     # Populate list of primary keys for deletion and records to upsert.
     deletions = []
     records = []
-    attributes = [attribute.name for attribute in dataset.attributes]
+    attributes = {attribute.name for attribute in dataset.attributes}
     for i in range(len(updates)):
         if updates[i] == "delete":
             deletions.append(primary_keys[i])
@@ -556,6 +746,50 @@ def update_records(
     return dataset
 
 
+def _run_each(func: Callable[[str], None], attribute_names: List[str], *, max_workers: int):
+    """Call a function for each attribute name, concurrently when `max_workers` is above 1
+
+    The attribute calls are independent HTTP requests, so running them in threads overlaps
+    their round trips. Any exception raised by a call is re-raised.
+
+    Args:
+        func: function to call with each attribute name
+        attribute_names: names of the attributes
+        max_workers: maximum number of calls to run at the same time
+    """
+    if max_workers <= 1 or len(attribute_names) <= 1:
+        for attribute_name in attribute_names:
+            func(attribute_name)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # consume the results so that exceptions raised in the threads are surfaced
+        list(executor.map(func, attribute_names))
+
+
+def _type_json(attr_type: attribute_type.AttributeType) -> JsonDict:
+    """Serialize an attribute type to JSON, once per distinct type. Most attributes share a few
+    types, often the default one, so the same JSON is reused rather than rebuilt per attribute.
+    The dictionary is shared between calls, so it must not be modified.
+
+    Args:
+        attr_type: Attribute type to serialize
+
+    Returns:
+        Json Dict
+    """
+    try:
+        return _cached_type_json(attr_type)
+    except TypeError:
+        # A Record built with a list of sub-attributes is not hashable, so it can't be cached
+        return attribute_type.to_json(attr_type=attr_type)
+
+
+@lru_cache(maxsize=None)
+def _cached_type_json(attr_type: attribute_type.AttributeType) -> JsonDict:
+    return attribute_type.to_json(attr_type=attr_type)
+
+
 def _make_spec_dict(
     attribute_name: str,
     attribute_types: Dict[str, attribute_type.AttributeType],
@@ -577,13 +811,13 @@ def _make_spec_dict(
     Returns:
         Json Dict
     """
-    if attribute_types is not None and attribute_name in attribute_types.keys():
+    if attribute_types is not None and attribute_name in attribute_types:
         attr_type = attribute_types[attribute_name]
     else:
         attr_type = attribute_type.DEFAULT
 
-    result = {"name": attribute_name, "type": attribute_type.to_json(attr_type=attr_type)}
+    result = {"name": attribute_name, "type": _type_json(attr_type)}
 
-    if attribute_descriptions is not None and attribute_name in attribute_descriptions.keys():
+    if attribute_descriptions is not None and attribute_name in attribute_descriptions:
         result["description"] = attribute_descriptions[attribute_name]
     return result
@@ -9,6 +9,8 @@ from typing import Optional, Union
 from time import sleep, time as now
 
 from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tamr_unify_client import Client
 from tamr_unify_client.auth import UsernamePasswordAuth
 from tamr_unify_client.auth import JwtTokenAuth
@@ -19,6 +21,10 @@ LOGGER = logging.getLogger(__name__)
 
 TAMR_JWT_RELEASE_VERSION = "2022.010.0"
 
+# Connections kept open to Tamr by sessions created here. This is above the requests default of
+# 10 so that concurrent calls, e.g. attribute calls with `max_workers` set, each reuse one
+_POOL_MAXSIZE = 32
+
 
 def health_check(client: Client) -> bool:
     """
@@ -44,6 +50,31 @@ def health_check(client: Client) -> bool:
         return False
 
 
+def _create_session() -> requests.Session:
+    """Creates a session for a new Tamr client
+
+    The session keeps a pool of connections to Tamr open for reuse, and retries gateway errors
+    for idempotent requests only, i.e. not for POST. Once retries are exhausted the last response
+    is returned, so that the caller still sees the error status
+
+    Returns:
+        The session
+    """
+    retry = Retry(
+        total=3,
+        connect=0,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 def create(
     *,
     username: str,
@@ -65,7 +96,8 @@ def create(
         port: The port of the Tamr UI. Pass a value of `None` to specify an address with no port
         protocol: https or http
         base_path: Optional argument to specify a different base path
-        session: Optional argument to pass an existing requests Session
+        session: Optional argument to pass an existing requests Session. If None, a session
+            which pools connections and retries gateway errors for idempotent requests is used
         store_auth_cookie: If true will allow Tamr authentication cookie to be stored and reused
         enforce_healthy: If true will enforce a healthy state upon creation
 
@@ -80,7 +112,7 @@ def create(
         port=int(port) if port is not None else None,
         protocol=protocol,
         base_path=base_path,
-        session=session,
+        session=session if session is not None else _create_session(),
         store_auth_cookie=store_auth_cookie,
     )
     if enforce_healthy:
@@ -111,7 +143,8 @@ def create_with_jwt(
         port: The port of the Tamr UI. Pass a value of `None` to specify an address with no port
         protocol: https or http
         base_path: Optional argument to specify a different base path
-        session: Optional argument to pass an existing requests Session
+        session: Optional argument to pass an existing requests Session. If None, a session
+            which pools connections and retries gateway errors for idempotent requests is used
         store_auth_cookie: If true will allow Tamr authentication cookie to be stored and reused
         enforce_healthy: If true will enforce a healthy state upon creation
 
@@ -126,7 +159,7 @@ def create_with_jwt(
         port=int(port) if port is not None else None,
         protocol=protocol,
         base_path=base_path,
-        session=session,
+        session=session if session is not None else _create_session(),
         store_auth_cookie=store_auth_cookie,
     )
 
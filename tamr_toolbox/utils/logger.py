@@ -83,7 +83,7 @@ def create(
     Returns:
         Logger object
     """
-    if type(name) is not str:
+    if not isinstance(name, str):
         raise TypeError
     if name == "":
         raise ValueError
@@ -1,5 +1,6 @@
 """Tasks related to the version of Tamr instances"""
 from functools import wraps
+from itertools import chain
 import inspect
 import json
 import logging
@@ -70,19 +71,16 @@ def _get_tamr_versions_from_function_args(*args, **kwargs) -> List[str]:
         List of all Tamr versions inputted to the function
 
     """
-    all_args = locals()
-    args = [arg for arg in all_args["args"]]
-    kwargs = list(all_args["kwargs"].values())
-    all_args_parsed = args + kwargs
     response = []
 
     # Return the client version (if we can find it)
-    for arg in all_args_parsed:
-        if type(arg) is Client:
+    for arg in chain(args, kwargs.values()):
+        if isinstance(arg, Client):
             response.append(current(arg))
-        elif hasattr(arg, "client"):
-            if type(arg.client) is Client:
-                response.append(current(arg.client))
+        else:
+            arg_client = getattr(arg, "client", None)
+            if isinstance(arg_client, Client):
+                response.append(current(arg_client))
 
     return response
 
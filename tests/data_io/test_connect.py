@@ -1,6 +1,14 @@
 """Tests for related to the Tamr auxiliary service DF-connect"""
+import copy
+import json
+import pickle
+from dataclasses import FrozenInstanceError
 import pytest
+import time
+import requests
+from tamr_unify_client.auth import UsernamePasswordAuth
 from tamr_toolbox.data_io.df_connect import client
+from tamr_toolbox.data_io.file_system_type import FileSystemType
 from tamr_toolbox.utils.config import from_yaml
 from tests._common import get_toolbox_root_dir
 
@@ -73,6 +81,46 @@ def test_create_bad_configuration():
         client.get_connect_session(my_connect)
 
 
+def test_get_connect_session_skips_recent_health_check():
+    my_connect = client.create(
+        host="localhost",
+        port="80",
+        protocol="http",
+        tamr_username="user",
+        tamr_password="password",
+        base_path="",
+        jdbc_dict=CONFIG["df_connect"]["jdbc"]["ingest"],
+    )
+    # the instance is unreachable, but was recently found healthy so it is not checked again
+    client._HEALTH_CACHE[my_connect._base_url] = time.monotonic() + 60
+    try:
+        assert client.get_connect_session(my_connect) is not None
+    finally:
+        del client._HEALTH_CACHE[my_connect._base_url]
+
+
+def test_get_connect_session_retries_only_safe_posts():
+    my_connect = client.from_config(CONFIG)
+    client._HEALTH_CACHE[my_connect._base_url] = time.monotonic() + 60
+    try:
+        session = client.get_connect_session(my_connect)
+    finally:
+        del client._HEALTH_CACHE[my_connect._base_url]
+
+    def retries_post(api_path: str) -> bool:
+        retry = session.get_adapter(client._get_url(my_connect, api_path)).max_retries
+        return retry.is_retry("POST", 503)
+
+    assert retries_post(client._PROFILE_PATH)
+    for fs_type in client._SUPPORTED_FS:
+        assert retries_post(client._AVRO_PATH.format(fs_type=fs_type.value))
+        assert retries_post(client._AVRO_SCHEMA_PATH.format(fs_type=fs_type.value))
+    assert not retries_post(client._EXPORT_PATH)
+    assert not retries_post(client._INGEST_PATH)
+    assert not retries_post(client._EXECUTE_PATH)
+    assert not retries_post(client._HEALTH_PATH)
+
+
 def test_get_url_http():
     my_connect = client.from_config(CONFIG)
     assert client._get_url(my_connect, "/api/jdbcIngest") == "http://localhost:9030/api/jdbcIngest"
@@ -116,6 +164,58 @@ def test_deployment_parsing():
     assert my_connect.tamr_password == "my_password"
 
 
+def test_client_uses_slots():
+    my_connect = client.from_config(CONFIG)
+    assert not hasattr(my_connect, "__dict__")
+    assert not hasattr(my_connect.jdbc_info, "__dict__")
+
+
+def test_client_is_frozen():
+    my_connect = client.from_config(CONFIG)
+    with pytest.raises(FrozenInstanceError):
+        my_connect.host = "otherhost"
+
+
+@pytest.mark.parametrize(
+    "round_trip", [copy.copy, copy.deepcopy, lambda info: pickle.loads(pickle.dumps(info))]
+)
+def test_client_round_trip(round_trip):
+    my_connect = client.from_config(CONFIG)
+    object.__setattr__(my_connect, "_session", requests.Session())
+    my_copy = round_trip(my_connect)
+    assert my_copy == my_connect
+    assert my_copy._base_url == my_connect._base_url
+    assert my_copy._auth_header == my_connect._auth_header
+    assert my_copy._ingest_template == my_connect._ingest_template
+    # the copy opens its own session rather than sharing the original's connections
+    assert my_copy._session is None
+
+
+def test_get_connect_session_reuses_session():
+    my_connect = client.from_config(CONFIG)
+    session = requests.Session()
+    object.__setattr__(my_connect, "_session", session)
+    # a cached session is returned without another health check against df_connect
+    assert client.get_connect_session(my_connect) is session
+
+
+@pytest.mark.parametrize(
+    "export_function", [client.export_dataset_avro_schema, client.export_dataset_as_avro]
+)
+def test_avro_export_unsupported_fs_type(export_function):
+    my_connect = client.from_config(CONFIG)
+    with pytest.raises(ValueError):
+        export_function(my_connect, url="/tmp/out", dataset_name="ds", fs_type=FileSystemType.S3)
+
+
+@pytest.mark.parametrize(
+    "username,password", [("my_user", "my_password"), ("", ""), ("user", "p@ss:wörd")]
+)
+def test_get_auth_header(username: str, password: str):
+    request = UsernamePasswordAuth(username, password)(requests.Request(headers={}))
+    assert client._get_auth_header(username, password) == request.headers["Authorization"]
+
+
 def test_certfile_parsing():
     my_connect = client.from_config(CONFIG_WITH_CERT)
     assert my_connect.host == "localhost"
@@ -145,6 +245,32 @@ def test_get_query_config_from_ingest():
     assert query_config["fetchSize"] == ingest_info.fetch_size
 
 
+@pytest.mark.parametrize(
+    "query,dataset_name,primary_key",
+    [
+        ("select * from table_a", "my_dataset", []),
+        ('select "id" from table_a', "my_dataset", ["id", "name"]),
+        ("select * from table_a where name = 'é'", "my_dätaset", ["id"]),
+    ],
+)
+def test_get_ingest_body(query: str, dataset_name: str, primary_key: list):
+    my_connect = client.from_config(CONFIG)
+    expected = json.dumps(
+        {
+            "query": query,
+            "datasetName": dataset_name,
+            "primaryKey": primary_key,
+            "queryConfig": client._get_query_config(my_connect.jdbc_info),
+        }
+    )
+    assert (
+        client._get_ingest_body(
+            my_connect, query=query, dataset_name=dataset_name, primary_key=primary_key
+        )
+        == expected
+    )
+
+
 def test_https_deployment_processing():
     my_connect = client.from_config(CONFIG_HTTPS)
     assert my_connect.protocol == "https"
@@ -66,6 +66,22 @@ def test_profile():
     )
 
 
+@mock_api()
+def test_profile_parallel():
+    my_profile_connect = client.from_config(CONFIG)
+    # one response is returned for each query
+    assert client.profile_query_results(
+        my_profile_connect,
+        dataset_name="test_df_connect_profile",
+        queries=[
+            "select * from dataset.dataset_ns_current limit 100",
+            "select * from dataset.attribute_ns_current limit 100",
+            "select * from dataset.dataset_ns_current limit 10",
+        ],
+        parallel=2,
+    ) == [True, True, True]
+
+
 @mock_api()
 def test_local_fs_avro_export():
     my_export_connect = client.from_config(CONFIG)
@@ -1,7 +1,11 @@
 """Tests for related to the Tamr Core-connect"""
+import gc
+import time
+import weakref
 import pytest
 import tamr_toolbox as tbox
 from tamr_toolbox import utils
+from tamr_toolbox.data_io.core_connect import jdbc
 from tamr_toolbox.utils.testing import mock_api
 from tamr_unify_client import Client
 from tests._common import get_toolbox_root_dir
@@ -81,3 +85,16 @@ def test_jdbc_ingest():
         == "org.postgresql.util.PSQLException: ERROR: relation 'dataset.dataset' does not exist\n"
         "  Position: 15"
     }
+
+
+def test_current_version_cache():
+    tamr_client = utils.client.create(**CONFIG["toolbox_test_instance"])
+    # a version fetched recently is reused without probing the instance
+    jdbc._VERSION_CACHE[tamr_client] = ("2021.002.0", time.monotonic() + 60)
+    assert jdbc._current_version(tamr_client) == "2021.002.0"
+
+    # the cache does not keep the client alive
+    client_ref = weakref.ref(tamr_client)
+    del tamr_client
+    gc.collect()
+    assert client_ref() is None
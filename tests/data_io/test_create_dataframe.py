@@ -1,4 +1,5 @@
 """Tests for tasks related to moving data in or out of Tamr using pandas.Dataframes"""
+import pandas as pd
 import pytest
 
 from tamr_toolbox.data_io import dataframe
@@ -52,6 +53,18 @@ def test_create_dataframe_then_flatten():
     assert df2.loc["-8652805551987624164", "ssn"] == ""
 
 
+def test_flatten_skips_non_object_columns():
+    df = pd.DataFrame(
+        {"names": [["a", "b"], ["c"], None], "count": [1, 2, 3], "score": [0.5, 1.5, 2.5]}
+    )
+    df1 = dataframe.flatten(df, delimiter="|")
+
+    assert df1["names"].tolist() == ["a|b", "c", None]
+    assert df1["count"].dtype == df["count"].dtype
+    assert df1["score"].dtype == df["score"].dtype
+    assert df["names"].tolist() == [["a", "b"], ["c"], None]
+
+
 @mock_api()
 def test_create_dataframe_flattened():
     client = utils.client.create(**CONFIG["toolbox_test_instance"])
@@ -4,6 +4,7 @@ from typing import List, Optional, Dict
 import io
 import os
 import tempfile
+from csv import QUOTE_ALL, get_dialect
 
 from tamr_toolbox.data_io import csv
 from tamr_toolbox import utils
@@ -436,3 +437,46 @@ def test_dataset_not_streamable():
         # ValueError raised by renaming that would yield duplicate columns
         with pytest.raises(RuntimeError):
             csv.from_dataset(dataset, filepath, allow_dataset_refresh=False)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("Dairy", False),
+        ("bone-in", False),
+        ("", True),
+        ("Meat,Beef", True),
+        ('6" sub', True),
+        ("line\nbreak", True),
+        (1, True),
+    ],
+)
+def test_needs_quoting(value, expected: bool):
+    assert csv._needs_quoting(value, special_characters=(",", '"', "\r", "\n")) == expected
+
+
+@pytest.mark.parametrize(
+    "column_keys, expected",
+    [
+        (("id", "names", "ssn", "count"), ["1", "Rob|Robert", "NaN", 3]),
+        (("names",), ["Rob|Robert"]),
+        (("count", "id"), [3, "1"]),
+        (("ssn", "id"), ["NaN", "1"]),
+    ],
+)
+def test_make_row_projector(column_keys: tuple, expected: list):
+    record = {"id": "1", "names": ["Rob", "Robert"], "ssn": None, "count": 3}
+    project_row = csv._make_row_projector(
+        column_keys, list_columns={"names"}, flatten=lambda value: "|".join(value), na_value="NaN"
+    )
+    assert project_row(record) == expected
+
+
+def test_get_dialect():
+    name = csv._get_dialect(delimiter="|", quote_character="'", quoting=QUOTE_ALL)
+    assert csv._get_dialect(delimiter="|", quote_character="'", quoting=QUOTE_ALL) == name
+    dialect = get_dialect(name)
+    assert dialect.delimiter == "|"
+    assert dialect.quotechar == "'"
+    assert dialect.quoting == QUOTE_ALL
+    assert csv._get_dialect(delimiter=",", quote_character="'", quoting=QUOTE_ALL) != name
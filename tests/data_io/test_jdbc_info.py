@@ -1,4 +1,8 @@
 """Tests for handling jdbc information for the Tamr auxiliary service DF-connect"""
+import copy
+import pickle
+import pytest
+from dataclasses import FrozenInstanceError
 
 from tamr_toolbox.data_io.df_connect import jdbc_info
 from tamr_toolbox.utils import config
@@ -12,3 +16,18 @@ def test_from_json():
     assert my_jdbc_info.jdbc_url == "tamr::jdbc_ingest"
     assert my_jdbc_info.db_user == "ingest_user"
     assert my_jdbc_info.db_password == "ingest_pw"
+
+
+def test_jdbc_info_is_frozen():
+    my_jdbc_info = jdbc_info.from_config(CONFIG)
+    assert hash(my_jdbc_info) == hash(jdbc_info.from_config(CONFIG))
+    with pytest.raises(FrozenInstanceError):
+        my_jdbc_info.db_user = "other_user"
+
+
+@pytest.mark.parametrize(
+    "round_trip", [copy.copy, copy.deepcopy, lambda info: pickle.loads(pickle.dumps(info))]
+)
+def test_jdbc_info_round_trip(round_trip):
+    my_jdbc_info = jdbc_info.from_config(CONFIG)
+    assert round_trip(my_jdbc_info) == my_jdbc_info
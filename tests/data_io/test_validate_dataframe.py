@@ -15,13 +15,6 @@ def _get_test_dataframe():
     return pd.DataFrame(vals, columns=["primary_key", "letter", "produce"], dtype="str")
 
 
-def test_count_null():
-    df = _get_test_dataframe()
-    assert dataframe._count_null(df["produce"]) == 0
-    df.loc[0, "produce"] = None
-    assert dataframe._count_null(df["produce"]) == 1
-
-
 def test_profile_dataframe():
     df = _get_test_dataframe()
     df_profile = dataframe.profile(df)
@@ -94,3 +87,14 @@ def test_check_custom():
 
     with pytest.raises(ValueError):
         dataframe.validate(df_check, custom_checks=((ensure_not_2, ["b"]),))
+
+
+def test_check_custom_column_named_map():
+    def ensure_3(value):
+        return value == 3
+
+    # a "map" column must not be mistaken for the DataFrame.map method
+    df_check = pd.DataFrame({"map": [3, 3, 3], "b": [2, 2, 2]})
+    dataframe.validate(df_check, custom_checks=((ensure_3, ["map"]),))
+    with pytest.raises(ValueError):
+        dataframe.validate(df_check, custom_checks=((ensure_3, ["map", "b"]),))
@@ -301,3 +301,23 @@ def test_partially_define_types():
 
     for idx in range(len(attribute_types)):
         assert tamr_attribute_types[idx].spec().to_dict() == expected_attribute_types[idx]
+
+
+@mock_api(enforce_online_test=enforce_online_test)
+def test_update_unchanged_attributes():
+    client = utils.client.create(**CONFIG["toolbox_test_instance"])
+    dataset = client.datasets.by_name(DATASET_NAME)
+    attribute_names = ["unique_id", "name", "address", "user_id", "sales_count"]
+
+    # The dataset already has these attributes, types and (empty) descriptions,
+    # so no attribute is edited, created or deleted
+    tbox.dataset.manage.update(
+        dataset=dataset,
+        attributes=attribute_names,
+        attribute_types={"user_id": Array(INT)},
+        override_existing_types=True,
+    )
+
+    updated_dataset = client.datasets.by_name(DATASET_NAME)
+    attribute_list = [attribute.name for attribute in updated_dataset.attributes.stream()]
+    assert attribute_list == attribute_names
@@ -1,8 +1,10 @@
 """Tests for tasks related creating and updating datasets in Tamr"""
+import pytest
+
 import tamr_toolbox as tbox
 from tamr_toolbox import utils
 from tamr_toolbox.utils.testing import mock_api
-from tamr_toolbox.models.attribute_type import Array, STRING, DOUBLE, INT
+from tamr_toolbox.models.attribute_type import Array, STRING, DOUBLE, INT, Record, SubAttribute
 
 from tests._common import get_toolbox_root_dir
 
@@ -112,3 +114,34 @@ def test_from_json():
 
     for i in range(len(converted_attr_types)):
         assert converted_attr_types[i] == expected_attribute_types[i]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_run_each(max_workers: int):
+    called = []
+    tbox.dataset.manage._run_each(called.append, ["a", "b", "c"], max_workers=max_workers)
+    assert sorted(called) == ["a", "b", "c"]
+
+
+def test_run_each_raises():
+    def fail(attribute_name: str):
+        raise ValueError(attribute_name)
+
+    with pytest.raises(ValueError):
+        tbox.dataset.manage._run_each(fail, ["a", "b"], max_workers=2)
+
+
+@pytest.mark.parametrize(
+    "attr_type",
+    [
+        Array(STRING),
+        INT,
+        Record(attributes=(SubAttribute(name="a", type=DOUBLE, is_nullable=True),)),
+        # a list of sub-attributes is not hashable, so it is serialized without the cache
+        Record(attributes=[SubAttribute(name="a", type=DOUBLE, is_nullable=True)]),
+    ],
+)
+def test_type_json(attr_type):
+    expected = tbox.models.attribute_type.to_json(attr_type=attr_type)
+    assert tbox.dataset.manage._type_json(attr_type) == expected
+    assert tbox.dataset.manage._type_json(attr_type) == expected
@@ -58,6 +58,15 @@ def test_passing_session():
     assert my_other_client.session == session
 
 
+def test_default_session():
+    my_client = utils.client.create(**CONFIG["my_instance_name"])
+    adapter = my_client.session.get_adapter("http://localhost:9100/api/versioned/v1/datasets")
+    assert adapter._pool_maxsize == utils.client._POOL_MAXSIZE
+    # gateway errors are retried for idempotent requests but not for POST
+    assert adapter.max_retries.is_retry("GET", 503)
+    assert not adapter.max_retries.is_retry("POST", 503)
+
+
 @mock_api()
 def test_client_enforce_healthy():
     my_client = utils.client.create(**CONFIG["my_instance_name"], enforce_healthy=True)